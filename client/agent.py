@@ -1,4 +1,5 @@
 """Agent module for handling LLM interactions and agentic workflows."""
+import asyncio
 import os
 import logging
 from typing import Dict, Any, List
@@ -19,6 +20,8 @@ class GroqAgent:
         self.llm = None
         self.executor = None
         self.tools = []
+        self.verbose = os.getenv("AGENT_VERBOSE", "false").lower() == "true"
+        self._setup_lock = asyncio.Lock()
         self._initialize_llm()
     
     def _initialize_llm(self):
@@ -38,10 +41,13 @@ class GroqAgent:
         
         try:
             async with await self.mcp_client_manager.get_managed_client() as client:
+                await self.mcp_client_manager.connect_all()
                 adapter = LangChainAdapter()
-                self.tools = await adapter.create_tools(client)
+                # Fixed tool order keeps the system prompt byte-stable for provider prompt caching
+                tools = await adapter.create_tools(client)
+                self.tools = sorted(tools, key=lambda tool: tool.name)
                 tool_names = [tool.name for tool in self.tools]
-                logger.info(f"Tools initialized: {tool_names}")
+                logger.info("Tools initialized: %s", tool_names)
                 
                 # Create system prompt with available tools
                 tool_names_str = ', '.join(tool_names)
@@ -64,7 +70,7 @@ class GroqAgent:
                     agent=agent,
                     tools=self.tools,
                     max_iterations=10,
-                    verbose=True,
+                    verbose=self.verbose,
                     return_intermediate_steps=True,
                     early_stopping_method="generate",
                     handle_parsing_errors=True
@@ -73,14 +79,13 @@ class GroqAgent:
                 logger.info("Agent executor setup completed")
                 
         except Exception as e:
-            logger.error(f"Failed to setup tools: {e}")
+            logger.error("Failed to setup tools: %s", e)
             raise
     
     async def process_query(self, query: str, context: str = None) -> Dict[str, Any]:
         """Process a user query and return the agent's response."""
         
-        if not self.executor:
-            await self.setup_tools()
+        await self._ensure_ready()
         
         try:
             # Add context to query if provided
@@ -88,22 +93,13 @@ class GroqAgent:
             if context:
                 full_input = f"Context: {context}\n\nUser query: {query}"
             
-            # Create a new MCP client connection for this query
-            async with await self.mcp_client_manager.get_managed_client() as client:
-                # Update tools with fresh MCP client connection
-                adapter = LangChainAdapter()
-                updated_tools = await adapter.create_tools(client)
-                
-                # Update executor with fresh tools
-                self.executor.tools = updated_tools
-                
-                # Process the query
-                result = await self.executor.ainvoke({
-                    "input": full_input
-                })
+            # Process the query
+            result = await self.executor.ainvoke({
+                "input": full_input
+            })
             
-            logger.debug(f"Query processed: {query}")
-            logger.debug(f"Intermediate steps: {result.get('intermediate_steps', [])}")
+            logger.debug("Query processed: %s", query)
+            logger.debug("Intermediate steps: %s", result.get('intermediate_steps', []))
             
             return {
                 'success': True,
@@ -113,7 +109,7 @@ class GroqAgent:
             }
             
         except Exception as e:
-            logger.error(f"Error processing query '{query}': {e}")
+            logger.exception("Error processing query '%s': %s", query, e)
             return {
                 'success': False,
                 'response': f"Sorry, I encountered an error while processing your request: {str(e)}",
@@ -121,8 +117,23 @@ class GroqAgent:
                 'query': query
             }
     
+    def _is_ready(self) -> bool:
+        """Check whether the executor and the MCP sessions its tools use are up."""
+        return bool(self.executor) and self.mcp_client_manager.has_active_sessions()
+    
+    async def _ensure_ready(self):
+        """Set up tools if needed, letting concurrent callers share one setup.
+        
+        Tools are built once in setup_tools and reused; they are rebuilt only
+        when the MCP sessions they are bound to have been torn down.
+        """
+        if self._is_ready():
+            return
+        async with self._setup_lock:
+            if not self._is_ready():
+                await self.setup_tools()
+    
     async def get_available_tools(self) -> List[str]:
         """Get list of available tool names."""
-        if not self.tools:
-            await self.setup_tools()
+        await self._ensure_ready()
         return [tool.name for tool in self.tools]
\ No newline at end of file
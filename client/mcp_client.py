@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from mcp_use.client import MCPClient
@@ -14,6 +15,13 @@ class MCPClientManager:
         # Enable mcp-use debug mode
         mcp_use.set_debug(debug_level)
     
+    async def __aenter__(self):
+        await self.initialize()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.cleanup()
+    
     @asynccontextmanager
     async def manage_client(self, client):
         """Context manager for MCP client sessions.
@@ -32,10 +40,10 @@ class MCPClientManager:
         try:
             if not self.client:
                 self.client = MCPClient.from_config_file(self.config_file_path)
-                logger.info(f"MCP client initialized with config: {self.config_file_path}")
+                logger.info("MCP client initialized with config: %s", self.config_file_path)
             return self.client
         except Exception as e:
-            logger.error(f"Failed to initialize MCP client: {e}")
+            logger.error("Failed to initialize MCP client: %s", e)
             raise
     
     async def get_managed_client(self):
@@ -44,10 +52,40 @@ class MCPClientManager:
             await self.initialize()
         return self.manage_client(self.client)
     
+    async def connect_all(self):
+        """Open sessions to every configured MCP server concurrently."""
+        if not self.client:
+            await self.initialize()
+        # Handshakes are I/O-bound, so connecting in parallel costs the slowest server, not the sum
+        names = [name for name in self.client.get_server_names() if name not in self.client.sessions]
+        # Let every handshake finish so each opened session is registered and
+        # cleanup() can close it; cancelling one mid-handshake would orphan its connector
+        results = await asyncio.gather(
+            *(self.client.create_session(name) for name in names),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return self.client.sessions
+    
+    def has_active_sessions(self) -> bool:
+        """Check whether the MCP client still holds open sessions."""
+        return bool(self.client and self.client.sessions)
+    
     async def cleanup(self):
         """Clean up MCP client connections."""
         if self.client:
-            for session in self.client.sessions.values():
-                await session.disconnect()
+            # Disconnect every server at once; one failure shouldn't block the others
+            names = list(self.client.sessions)
+            results = await asyncio.gather(
+                *(session.disconnect() for session in self.client.sessions.values()),
+                return_exceptions=True
+            )
+            for name, result in zip(names, results):
+                if isinstance(result, Exception):
+                    logger.error("Failed to disconnect MCP server '%s': %s", name, result)
             self.client.sessions.clear()
+            # Reset active sessions so the next setup reconnects
+            self.client.active_sessions.clear()
             logger.info("MCP client cleanup completed")
@@ -1,11 +1,10 @@
 import os
 import logging
+import time
 
 import discord
 
 from discord.ext import commands
-print("discord.py imported successfully")
-import logging
 from typing import Optional
 
 logger = logging.getLogger(__name__)
@@ -22,6 +21,7 @@ class DiscordBot:
         self.agent_processor = agent_processor
         self.bot_token = os.getenv("DISCORD_BOT_TOKEN")
         self.bot_user_id = None
+        self.mention_tags = ()
         
         if not self.bot_token:
             raise ValueError("DISCORD_BOT_TOKEN not found in environment variables")
@@ -44,16 +44,29 @@ class DiscordBot:
         
         logger.info("Discord bot initialized")
     
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close_bot()
+    
     def get_bot(self):
         """Get the Discord bot instance."""
         return self.bot
     
+    async def login_bot(self):
+        """Log in to Discord without opening the gateway connection."""
+        await self.bot.login(self.bot_token)
+    
     async def start_bot(self):
         """Start the Discord bot."""
         try:
-            await self.bot.start(self.bot_token)
+            # Reuse an earlier login_bot() session if there is one
+            if self.bot.user is None:
+                await self.bot.login(self.bot_token)
+            await self.bot.connect()
         except Exception as e:
-            logger.error(f"Failed to start Discord bot: {e}")
+            logger.error("Failed to start Discord bot: %s", e)
             raise
     
     async def close_bot(self):
@@ -65,13 +78,26 @@ class DiscordBot:
         """Set the agent processor for handling queries."""
         self.agent_processor = agent_processor
     
+    def set_bot_user_id(self, user_id: int):
+        """Store the bot's user ID and precompute its mention tags."""
+        self.bot_user_id = user_id
+        self.mention_tags = (f'<@{user_id}>', f'<@!{user_id}>')
+    
     def is_rate_limited(self, user_id: int) -> bool:
         """Check if user is rate limited."""
-        import time
-        current_time = time.time()
-        last_request = self.user_cooldowns.get(user_id, 0)
+        # Monotonic clock so wall-clock adjustments can't extend or skip cooldowns
+        current_time = time.monotonic()
+        
+        # Entries are inserted in request order, so expired cooldowns form a prefix
+        # of the dict; drop them to keep it bounded by recently active users
+        while self.user_cooldowns:
+            oldest_user = next(iter(self.user_cooldowns))
+            if current_time - self.user_cooldowns[oldest_user] < self.rate_limit_seconds:
+                break
+            del self.user_cooldowns[oldest_user]
         
-        if current_time - last_request < self.rate_limit_seconds:
+        # Anything left after pruning is still cooling down
+        if user_id in self.user_cooldowns:
             return True
         
         self.user_cooldowns[user_id] = current_time
@@ -80,40 +106,22 @@ class DiscordBot:
     def extract_mention_content(self, message: discord.Message) -> Optional[str]:
         """Extract content from message after removing bot mention.
         
+        The caller is expected to have already checked that the message
+        mentions the bot.
+        
         Args:
             message: Discord message object
             
         Returns:
-            Cleaned message content or None if not a valid mention
+            Cleaned message content or None if nothing is left
         """
         if not self.bot_user_id:
             return None
         
-        # Check if bot is mentioned
-        if self.bot.user not in message.mentions:
-            return None
-        
         # Remove bot mention from content
         content = message.content
-        mention_patterns = [
-            f'<@{self.bot_user_id}>',
-            f'<@!{self.bot_user_id}>',
-        ]
-        
-        for pattern in mention_patterns:
-            content = content.replace(pattern, '').strip()
+        for pattern in self.mention_tags:
+            content = content.replace(pattern, '')
+        content = content.strip()
         
         return content if content else None
-    
-    def get_message_context(self, message: discord.Message, history_limit: int = 5) -> str:
-        """Get context from recent messages in the channel.
-        
-        Args:
-            message: Current message
-            history_limit: Number of previous messages to include
-            
-        Returns:
-            String containing message history context
-        """
-        # This will be implemented in events.py where we have access to the message history
-        return ""
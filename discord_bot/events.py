@@ -1,11 +1,44 @@
 import discord
-from discord.ext import commands
 import logging
 import asyncio
-from typing import Optional
+from collections import OrderedDict, deque
 
 logger = logging.getLogger(__name__)
 
+# Number of recent messages remembered per channel for conversation context
+CHANNEL_HISTORY_SIZE = 10
+
+# Number of recent messages included in the context sent to the agent
+CONTEXT_MESSAGES = 3
+
+# Maximum number of channels whose history is kept; least recently active are dropped
+MAX_TRACKED_CHANNELS = 2048
+
+def _iter_chunks(text: str, size: int):
+    """Yield pieces of text no longer than size, preferring to split on a newline or space.
+    
+    Args:
+        text: Text to split
+        size: Maximum length of each piece
+    """
+    start = 0
+    length = len(text)
+    while length - start > size:
+        end = start + size
+        # A break right on the limit still fits, the separator itself is dropped
+        split = text.rfind('\n', start + 1, end + 1)
+        if split == -1:
+            split = text.rfind(' ', start + 1, end + 1)
+        if split == -1:
+            # No whitespace to break on, cut at the hard limit
+            yield text[start:end]
+            start = end
+        else:
+            yield text[start:split]
+            start = split + 1
+    if start < length:
+        yield text[start:]
+
 class DiscordEvents:
     """Handles Discord events and message processing."""
     
@@ -20,6 +53,9 @@ class DiscordEvents:
         self.agent_processor = agent_processor
         self.bot = bot_instance.get_bot()
         
+        # Recent (message id, author, content) entries per channel, fed by on_message
+        self._channel_history = OrderedDict()
+        
         # Register event handlers
         self._register_events()
         
@@ -31,70 +67,123 @@ class DiscordEvents:
         @self.bot.event
         async def on_ready():
             """Called when bot is ready."""
-            logger.info(f'{self.bot.user} has connected to Discord!')
-            logger.info(f'Bot ID: {self.bot.user.id}')
-            
-            # Store bot user ID for mention detection
-            self.bot_instance.bot_user_id = self.bot.user.id
-            
-            # Set bot status
-            await self.bot.change_presence(
-                activity=discord.Activity(
-                    type=discord.ActivityType.watching,
-                    name="for @mentions | Crypto data at your service!"
-                )
-            )
+            await self._handle_ready()
         
         @self.bot.event
         async def on_message(message):
             """Handle incoming messages."""
-            # Ignore messages from the bot itself
-            if message.author == self.bot.user:
-                return
-            
-            # Check if bot is mentioned
-            if self.bot.user not in message.mentions:
-                return
-            
-            # Check rate limiting
-            if self.bot_instance.is_rate_limited(message.author.id):
-                await message.reply("⏰ Please wait a moment before sending another request.", 
-                                  mention_author=False)
-                return
-            
-            # Extract query content
-            query = self.bot_instance.extract_mention_content(message)
-            if not query:
-                await message.reply("👋 Hello! Please include your question after mentioning me.", 
-                                  mention_author=False)
-                return
-            
+            await self._handle_message(message)
+        
+        @self.bot.event
+        async def on_error(event, *args, **kwargs):
+            """Handle Discord errors."""
+            logger.exception("Discord error in %s: %s", event, args)
+        
+        @self.bot.event
+        async def on_command_error(ctx, error):
+            """Handle command errors."""
+            logger.error("Command error: %s", error)
+    
+    async def _handle_ready(self):
+        """Store bot identity and set presence once connected."""
+        logger.info("%s has connected to Discord!", self.bot.user)
+        logger.info("Bot ID: %s", self.bot.user.id)
+        
+        # Store bot user ID for mention detection
+        self.bot_instance.set_bot_user_id(self.bot.user.id)
+        
+        # Set bot status
+        await self.bot.change_presence(
+            activity=discord.Activity(
+                type=discord.ActivityType.watching,
+                name="for @mentions | Crypto data at your service!"
+            )
+        )
+    
+    async def _handle_message(self, message: discord.Message):
+        """Respond to a message that mentions the bot.
+        
+        Args:
+            message: Incoming Discord message
+        """
+        # Ignore messages from bots, including this one, before any other work
+        if message.author.bot:
+            return
+        
+        bot_instance = self.bot_instance
+        
+        # Remember the message so context can be built without a history request
+        self._remember_message(message)
+        
+        # Check if bot is mentioned, comparing IDs rather than User objects
+        bot_user_id = bot_instance.bot_user_id
+        if not any(user.id == bot_user_id for user in message.mentions):
+            return
+        
+        # Check rate limiting
+        if bot_instance.is_rate_limited(message.author.id):
+            await message.reply("⏰ Please wait a moment before sending another request.", 
+                              mention_author=False)
+            return
+        
+        # Extract query content
+        query = bot_instance.extract_mention_content(message)
+        if not query:
+            await message.reply("👋 Hello! Please include your question after mentioning me.", 
+                              mention_author=False)
+            return
+        
+        # Start processing before the typing request so the two round-trips overlap
+        processing = asyncio.create_task(self._answer_query(query, message))
+        
+        try:
             # Show typing indicator
             async with message.channel.typing():
                 try:
-                    # Get message context
-                    context = await self._get_message_context(message)
-                    
-                    # Process query with agent
-                    result = await self._process_query_with_agent(query, context, message)
+                    result = await processing
                     
                     # Send response
                     await self._send_response(message, result)
                     
                 except Exception as e:
-                    logger.error(f"Error processing message: {e}")
+                    logger.exception("Error processing message: %s", e)
                     await message.reply(f"❌ Sorry, I encountered an error: {str(e)}", 
                                       mention_author=False)
+        finally:
+            # Don't leave processing running if the typing indicator failed to start
+            processing.cancel()
+    
+    async def _answer_query(self, query: str, message: discord.Message) -> dict:
+        """Gather channel context and process the query with the agent.
         
-        @self.bot.event
-        async def on_error(event, *args, **kwargs):
-            """Handle Discord errors."""
-            logger.error(f"Discord error in {event}: {args}")
+        Args:
+            query: User's query
+            message: Original Discord message
+            
+        Returns:
+            Dictionary with processing results
+        """
+        # Get message context
+        context = await self._get_message_context(message)
         
-        @self.bot.event
-        async def on_command_error(ctx, error):
-            """Handle command errors."""
-            logger.error(f"Command error: {error}")
+        # Process query with agent
+        return await self._process_query_with_agent(query, context, message)
+    
+    def _remember_message(self, message: discord.Message):
+        """Record a message in its channel's recent history.
+        
+        Args:
+            message: Message to record
+        """
+        channel_id = message.channel.id
+        history = self._channel_history.get(channel_id)
+        if history is None:
+            history = self._channel_history[channel_id] = deque(maxlen=CHANNEL_HISTORY_SIZE)
+            if len(self._channel_history) > MAX_TRACKED_CHANNELS:
+                self._channel_history.popitem(last=False)
+        else:
+            self._channel_history.move_to_end(channel_id)
+        history.append((message.id, message.author.display_name, message.content[:100]))
     
     async def _get_message_context(self, message: discord.Message, history_limit: int = 5) -> str:
         """Get context from recent messages in the channel.
@@ -106,19 +195,29 @@ class DiscordEvents:
         Returns:
             String containing message history context
         """
+        history = self._channel_history.get(message.channel.id)
+        if history:
+            recent = [f"{author}: {content}" for msg_id, author, content in history if msg_id != message.id]
+            if recent:
+                return "Recent conversation: " + " | ".join(recent[-CONTEXT_MESSAGES:])
+        
         try:
-            # Get recent messages from the channel
+            # Nothing seen in this channel since startup, fetch from Discord
             messages = []
+            bot_user_id = self.bot.user.id
             async for msg in message.channel.history(limit=history_limit + 1, before=message):
                 # Skip bot messages and very old messages
-                if msg.author != self.bot.user:
+                if msg.author.id != bot_user_id:
                     messages.append(f"{msg.author.display_name}: {msg.content[:100]}")
+                    # History is newest first, so stop once enough recent messages are in
+                    if len(messages) == CONTEXT_MESSAGES:
+                        break
             
             if messages:
-                return "Recent conversation: " + " | ".join(reversed(messages[-3:]))
+                return "Recent conversation: " + " | ".join(reversed(messages))
             return ""
         except Exception as e:
-            logger.debug(f"Could not get message context: {e}")
+            logger.debug("Could not get message context: %s", e)
             return ""
     
     async def _process_query_with_agent(self, query: str, context: str, message: discord.Message) -> dict:
@@ -141,17 +240,18 @@ class DiscordEvents:
         
         try:
             # Add Discord-specific context
-            discord_context = f"Discord user: {message.author.display_name}"
+            context_parts = [f"Discord user: {message.author.display_name}"]
             if message.guild:
-                discord_context += f" | Server: {message.guild.name}"
+                context_parts.append(f"Server: {message.guild.name}")
             if context:
-                discord_context += f" | {context}"
+                context_parts.append(context)
+            discord_context = " | ".join(context_parts)
             
             result = await self.agent_processor.process_query(query, discord_context)
             return result
             
         except Exception as e:
-            logger.error(f"Error in agent processing: {e}")
+            logger.exception("Error in agent processing: %s", e)
             return {
                 'success': False,
                 'response': f"🔧 Processing error: {str(e)}",
@@ -165,25 +265,20 @@ class DiscordEvents:
             message: Original Discord message
             result: Processing result from agent
         """
-        response = result.get('response', 'No response generated')
+        response = result.get('response') or 'No response generated'
         
         # Add status emoji based on success
-        if result.get('success', False):
-            if len(response) > 1900:  # Discord message limit with some buffer
-                # Split long responses
-                chunks = [response[i:i+1900] for i in range(0, len(response), 1900)]
-                for i, chunk in enumerate(chunks):
-                    if i == 0:
-                        await message.reply(f"📊 {chunk}", mention_author=False)
-                    else:
-                        await message.channel.send(f"📊 (continued) {chunk}")
+        emoji = "📊" if result.get('success', False) else "❌"
+        
+        # Split long responses; Discord message limit is 2000 so keep some buffer
+        for i, chunk in enumerate(_iter_chunks(response, 1900)):
+            if i == 0:
+                await message.reply(f"{emoji} {chunk}", mention_author=False)
             else:
-                await message.reply(f"📊 {response}", mention_author=False)
-        else:
-            await message.reply(f"❌ {response}", mention_author=False)
+                await message.channel.send(f"{emoji} (continued) {chunk}")
         
         # Log the interaction
-        logger.info(f"Processed query from {message.author.display_name}: '{result.get('query', 'Unknown')}' - Success: {result.get('success', False)}")
+        logger.info("Processed query from %s: '%s' - Success: %s", message.author.display_name, result.get('query', 'Unknown'), result.get('success', False))
     
     def set_agent_processor(self, agent_processor):
         """Set the agent processor for handling queries."""
@@ -3,27 +3,42 @@ AgentZer0 Discord Bot - Entry Point
 Integrates Discord functionality with Groq LLM and MCP client for cryptocurrency data.
 """
 import asyncio
+import atexit
+import contextlib
 import os
 import logging
+import queue
 import signal
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from dotenv import load_dotenv
 
+try:
+    import uvloop
+except ImportError:  # uvloop is optional and unavailable on Windows
+    uvloop = None
+
 # Import our modular components
 from client.mcp_client import MCPClientManager
 from client.agent import GroqAgent
 from discord_bot.bot import DiscordBot
 from discord_bot.events import DiscordEvents
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('agentzer0.log')
-    ]
-)
+# Configure logging; a background listener writes records so the event loop never waits on I/O.
+# QueueHandler still formats each emitted record on the calling thread, so keep log arguments lazy.
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.StreamHandler(sys.stdout),
+    logging.FileHandler('agentzer0.log')
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+logging.getLogger().addHandler(QueueHandler(_log_queue))
+logging.getLogger().setLevel(logging.INFO)
 logger = logging.getLogger(__name__)
 
 class AgentZer0Bot:
@@ -37,6 +52,10 @@ class AgentZer0Bot:
         self.discord_events = None
         self.running = False
         
+        # Owns component lifetimes; closing it tears them down in reverse order
+        self._exit_stack = contextlib.AsyncExitStack()
+        self._shutdown_task = None
+        
         # Load environment variables
         load_dotenv()
         self._validate_environment()
@@ -58,26 +77,38 @@ class AgentZer0Bot:
             
             # Initialize MCP Client Manager
             config_path = "config/mcp_servers.json"
-            self.mcp_client_manager = MCPClientManager(config_path)
+            self.mcp_client_manager = await self._exit_stack.enter_async_context(
+                MCPClientManager(config_path)
+            )
             logger.info("MCP Client Manager initialized")
             
             # Initialize Groq Agent
             self.agent = GroqAgent(self.mcp_client_manager)
-            await self.agent.setup_tools()
-            logger.info("Groq Agent initialized with tools")
             
             # Initialize Discord Bot
-            self.discord_bot = DiscordBot(self.agent)
+            self.discord_bot = await self._exit_stack.enter_async_context(DiscordBot(self.agent))
             logger.info("Discord Bot initialized")
             
             # Initialize Discord Events
             self.discord_events = DiscordEvents(self.discord_bot, self.agent)
             logger.info("Discord Events initialized")
             
+            # Tool setup and Discord login are independent round-trips, run them together;
+            # both run to completion so every session opened is closed by teardown
+            results = await asyncio.gather(
+                self.agent.setup_tools(),
+                self.discord_bot.login_bot(),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            logger.info("Groq Agent initialized with tools")
+            
             logger.info("All components initialized successfully!")
             
         except Exception as e:
-            logger.error(f"Initialization failed: {e}")
+            logger.error("Initialization failed: %s", e)
             raise
     
     async def start(self):
@@ -91,50 +122,52 @@ class AgentZer0Bot:
         try:
             await self.discord_bot.start_bot()
         except Exception as e:
-            logger.error(f"Bot startup failed: {e}")
+            logger.error("Bot startup failed: %s", e)
             await self.shutdown()
             raise
     
     async def shutdown(self):
-        """Gracefully shutdown the bot."""
-        if not self.running:
-            return
+        """Gracefully shutdown the bot.
         
+        Safe to call more than once; later callers wait for the first shutdown.
+        """
+        if self._shutdown_task is None:
+            self._shutdown_task = asyncio.ensure_future(self._close_components())
+        await self._shutdown_task
+    
+    async def _close_components(self):
+        """Close every component that was set up, in reverse order."""
         logger.info("Shutting down AgentZer0 Discord Bot...")
         self.running = False
         
         try:
-            # Cleanup MCP client first to ensure all connections are properly closed
-            if self.mcp_client_manager:
-                await self.mcp_client_manager.cleanup()
-                logger.info("MCP client cleanup completed")
-            
-            # Close Discord connection
-            if self.discord_bot:
-                await self.discord_bot.close_bot()
-                logger.info("Discord bot connection closed")
-            
+            # Closes the Discord connection, then the MCP client. Each exit runs
+            # even if an earlier one fails or initialization stopped halfway.
+            await self._exit_stack.aclose()
             logger.info("Shutdown completed successfully")
             
         except Exception as e:
-            logger.error(f"Error during shutdown: {e}")
-
-# Global bot instance for signal handling
-bot_instance = None
-
-def signal_handler(signum, frame):
-    """Handle shutdown signals."""
-    logger.info(f"Received signal {signum}, initiating graceful shutdown...")
-    if bot_instance:
-        asyncio.create_task(bot_instance.shutdown())
+            logger.exception("Error during shutdown: %s", e)
 
 async def main():
     """Main entry point."""
-    global bot_instance
+    bot_instance = None
+    loop = asyncio.get_running_loop()
+    
+    def request_shutdown(signum):
+        """Handle shutdown signals on the event loop."""
+        logger.info("Received signal %s, initiating graceful shutdown...", signum)
+        if bot_instance:
+            asyncio.create_task(bot_instance.shutdown())
     
     # Setup signal handlers for graceful shutdown
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, request_shutdown, signum)
+        except NotImplementedError:
+            # Windows event loops don't support add_signal_handler, so hand the
+            # signal over to the loop thread instead of acting in signal context
+            signal.signal(signum, lambda sig, frame: loop.call_soon_threadsafe(request_shutdown, sig))
     
     try:
         # Create and start bot
@@ -144,16 +177,17 @@ async def main():
     except KeyboardInterrupt:
         logger.info("Received keyboard interrupt")
     except Exception as e:
-        logger.error(f"Fatal error: {e}")
+        logger.exception("Fatal error: %s", e)
     finally:
         if bot_instance:
             await bot_instance.shutdown()
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        # Use the libuv-based event loop when it is installed
+        asyncio.run(main(), loop_factory=uvloop.new_event_loop if uvloop else None)
     except KeyboardInterrupt:
         logger.info("Application terminated by user")
     except Exception as e:
-        logger.error(f"Application failed: {e}")
+        logger.error("Application failed: %s", e)
         sys.exit(1)
\ No newline at end of file
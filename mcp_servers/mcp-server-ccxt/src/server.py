@@ -1,4 +1,7 @@
 import asyncio
+import json
+import time
+from collections import OrderedDict
 from typing import Any, Dict, List
 import ccxt.async_support as ccxt
 import mcp.types as types
@@ -23,9 +26,25 @@ SUPPORTED_EXCHANGES = {
     'mexc': ccxt.mexc
 }
 
+# The supported exchanges never change at runtime, so their listing is rendered once
+EXCHANGE_LIST_TEXT = "Supported exchanges:\n\n" + "\n".join(f"- {ex.upper()}" for ex in SUPPORTED_EXCHANGES)
+
 # Exchange instances cache
 exchange_instances = {}
 
+# Recent tool results keyed by tool name and arguments
+result_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+# Seconds a tool result is reused for an identical call, and how many are kept
+RESULT_CACHE_TTL = 10
+RESULT_CACHE_SIZE = 256
+
+# Tool calls still in flight, keyed like result_cache, so identical concurrent calls share one request
+pending_results: Dict[str, asyncio.Task] = {}
+
+# Candle count above which formatting is moved off the event loop
+OHLCV_OFFLOAD_THRESHOLD = 1000
+
 
 async def get_exchange(exchange_id: str) -> ccxt.Exchange:
     """Get or create an exchange instance."""
@@ -40,7 +59,16 @@ async def get_exchange(exchange_id: str) -> ccxt.Exchange:
     return exchange_instances[exchange_id]
 
 
-async def format_ticker(ticker: Dict[str, Any], exchange_id: str) -> str:
+async def close_exchanges():
+    """Close every cached exchange instance and its HTTP session."""
+    await asyncio.gather(
+        *(instance.close() for instance in exchange_instances.values()),
+        return_exceptions=True
+    )
+    exchange_instances.clear()
+
+
+def format_ticker(ticker: Dict[str, Any], exchange_id: str) -> str:
     """Format ticker data into a readable string."""
     return (
         f"Exchange: {exchange_id.upper()}\n"
@@ -55,14 +83,13 @@ async def format_ticker(ticker: Dict[str, Any], exchange_id: str) -> str:
     )
 
 
-def get_exchange_schema() -> Dict[str, Any]:
-    """Get the JSON schema for exchange selection."""
-    return {
-        "type": "string",
-        "description": f"Exchange to use (supported: {', '.join(SUPPORTED_EXCHANGES.keys())})",
-        "enum": list(SUPPORTED_EXCHANGES.keys()),
-        "default": "coinbase"
-    }
+# JSON schema for exchange selection, shared by every exchange-backed tool
+EXCHANGE_SCHEMA: Dict[str, Any] = {
+    "type": "string",
+    "description": f"Exchange to use (supported: {', '.join(SUPPORTED_EXCHANGES.keys())})",
+    "enum": list(SUPPORTED_EXCHANGES.keys()),
+    "default": "coinbase"
+}
 
 
 def format_ohlcv_data(ohlcv_data: List[List], timeframe: str) -> str:
@@ -96,269 +123,354 @@ def format_ohlcv_data(ohlcv_data: List[List], timeframe: str) -> str:
     return "\n".join(formatted_data)
 
 
-@server.list_tools()
-async def handle_list_tools() -> List[types.Tool]:
-    """List available cryptocurrency tools."""
-    return [
-        # Market Data Tools
-        types.Tool(
-            name="get-price",
-            description="Get current price of a cryptocurrency pair from a specific exchange",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {
-                        "type": "string",
-                        "description": "Trading pair symbol (e.g., BTC/USDT, ETH/USDT)",
-                    },
-                    "exchange": get_exchange_schema()
+# Tool definitions are static, so build them once instead of per list_tools request
+TOOLS: List[types.Tool] = [
+    # Market Data Tools
+    types.Tool(
+        name="get-price",
+        description="Get current price of a cryptocurrency pair from a specific exchange",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {
+                    "type": "string",
+                    "description": "Trading pair symbol (e.g., BTC/USDT, ETH/USDT)",
                 },
-                "required": ["symbol"],
+                "exchange": EXCHANGE_SCHEMA
             },
-        ),
-        types.Tool(
-            name="get-market-summary",
-            description="Get detailed market summary for a cryptocurrency pair from a specific exchange",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {
-                        "type": "string",
-                        "description": "Trading pair symbol (e.g., BTC/USDT, ETH/USDT)",
-                    },
-                    "exchange": get_exchange_schema()
+            "required": ["symbol"],
+        },
+    ),
+    types.Tool(
+        name="get-market-summary",
+        description="Get detailed market summary for a cryptocurrency pair from a specific exchange",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {
+                    "type": "string",
+                    "description": "Trading pair symbol (e.g., BTC/USDT, ETH/USDT)",
                 },
-                "required": ["symbol"],
+                "exchange": EXCHANGE_SCHEMA
             },
-        ),
-        types.Tool(
-            name="get-top-volumes",
-            description="Get top cryptocurrencies by trading volume from a specific exchange",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "limit": {
-                        "type": "number",
-                        "description": "Number of pairs to return (default: 5)",
-                    },
-                    "exchange": get_exchange_schema()
-                }
-            },
-        ),
-        types.Tool(
-            name="list-exchanges",
-            description="List all supported cryptocurrency exchanges",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            },
-        ),
-        # Historical Data Tools
-        types.Tool(
-            name="get-historical-ohlcv",
-            description="Get historical OHLCV (candlestick) data for a trading pair",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {
-                        "type": "string",
-                        "description": "Trading pair symbol (e.g., BTC/USDT, ETH/USDT)",
-                    },
-                    "timeframe": {
-                        "type": "string",
-                        "description": "Timeframe for candlesticks (e.g., 1m, 5m, 15m, 1h, 4h, 1d)",
-                        "enum": ["1m", "5m", "15m", "1h", "4h", "1d"],
-                        "default": "1h"
-                    },
-                    "days_back": {
-                        "type": "number",
-                        "description": "Number of days of historical data to fetch (default: 7, max: 30)",
-                        "default": 7,
-                        "maximum": 30
-                    },
-                    "exchange": get_exchange_schema()
+            "required": ["symbol"],
+        },
+    ),
+    types.Tool(
+        name="get-top-volumes",
+        description="Get top cryptocurrencies by trading volume from a specific exchange",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "number",
+                    "description": "Number of pairs to return (default: 5)",
+                },
+                "exchange": EXCHANGE_SCHEMA
+            }
+        },
+    ),
+    types.Tool(
+        name="list-exchanges",
+        description="List all supported cryptocurrency exchanges",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        },
+    ),
+    # Historical Data Tools
+    types.Tool(
+        name="get-historical-ohlcv",
+        description="Get historical OHLCV (candlestick) data for a trading pair",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {
+                    "type": "string",
+                    "description": "Trading pair symbol (e.g., BTC/USDT, ETH/USDT)",
                 },
-                "required": ["symbol"],
+                "timeframe": {
+                    "type": "string",
+                    "description": "Timeframe for candlesticks (e.g., 1m, 5m, 15m, 1h, 4h, 1d)",
+                    "enum": ["1m", "5m", "15m", "1h", "4h", "1d"],
+                    "default": "1h"
+                },
+                "days_back": {
+                    "type": "number",
+                    "description": "Number of days of historical data to fetch (default: 7, max: 30)",
+                    "default": 7,
+                    "maximum": 30
+                },
+                "exchange": EXCHANGE_SCHEMA
             },
-        ),
-        types.Tool(
-            name="get-price-change",
-            description="Get price change statistics over different time periods",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {
-                        "type": "string",
-                        "description": "Trading pair symbol (e.g., BTC/USDT, ETH/USDT)",
-                    },
-                    "exchange": get_exchange_schema()
+            "required": ["symbol"],
+        },
+    ),
+    types.Tool(
+        name="get-price-change",
+        description="Get price change statistics over different time periods",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {
+                    "type": "string",
+                    "description": "Trading pair symbol (e.g., BTC/USDT, ETH/USDT)",
                 },
-                "required": ["symbol"],
+                "exchange": EXCHANGE_SCHEMA
             },
-        ),
-        types.Tool(
-            name="get-volume-history",
-            description="Get trading volume history over time",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {
-                        "type": "string",
-                        "description": "Trading pair symbol (e.g., BTC/USDT, ETH/USDT)",
-                    },
-                    "days": {
-                        "type": "number",
-                        "description": "Number of days of volume history (default: 7, max: 30)",
-                        "default": 7,
-                        "maximum": 30
-                    },
-                    "exchange": get_exchange_schema()
+            "required": ["symbol"],
+        },
+    ),
+    types.Tool(
+        name="get-volume-history",
+        description="Get trading volume history over time",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {
+                    "type": "string",
+                    "description": "Trading pair symbol (e.g., BTC/USDT, ETH/USDT)",
                 },
-                "required": ["symbol"],
+                "days": {
+                    "type": "number",
+                    "description": "Number of days of volume history (default: 7, max: 30)",
+                    "default": 7,
+                    "maximum": 30
+                },
+                "exchange": EXCHANGE_SCHEMA
             },
+            "required": ["symbol"],
+        },
+    ),
+]
+
+
+@server.list_tools()
+async def handle_list_tools() -> List[types.Tool]:
+    """List available cryptocurrency tools."""
+    return TOOLS
+
+
+async def list_exchanges() -> List[types.TextContent]:
+    """Exchanges this server can query."""
+    return [
+        types.TextContent(
+            type="text",
+            text=EXCHANGE_LIST_TEXT
+        )
+    ]
+
+
+async def get_price(
+    exchange: ccxt.Exchange, exchange_id: str, arguments: Dict[str, Any]
+) -> List[types.TextContent]:
+    """Current price of a trading pair."""
+    symbol = arguments.get("symbol", "").upper()
+    ticker = await exchange.fetch_ticker(symbol)
+
+    return [
+        types.TextContent(
+            type="text",
+            text=f"Current price of {symbol} on {exchange_id.upper()}: {ticker['last']} {symbol.split('/')[1]}"
+        )
+    ]
+
+
+async def get_market_summary(
+    exchange: ccxt.Exchange, exchange_id: str, arguments: Dict[str, Any]
+) -> List[types.TextContent]:
+    """Ticker summary for a trading pair."""
+    symbol = arguments.get("symbol", "").upper()
+    ticker = await exchange.fetch_ticker(symbol)
+
+    formatted_data = format_ticker(ticker, exchange_id)
+    return [
+        types.TextContent(
+            type="text",
+            text=f"Market summary for {symbol}:\n\n{formatted_data}"
+        )
+    ]
+
+
+async def get_top_volumes(
+    exchange: ccxt.Exchange, exchange_id: str, arguments: Dict[str, Any]
+) -> List[types.TextContent]:
+    """Trading pairs with the highest base volume."""
+    limit = int(arguments.get("limit", 5))
+    tickers = await exchange.fetch_tickers()
+
+    # Sort by volume and get top N
+    sorted_tickers = sorted(
+        tickers.values(),
+        key=lambda x: float(x.get('baseVolume', 0) or 0),
+        reverse=True
+    )[:limit]
+
+    return [
+        types.TextContent(
+            type="text",
+            text=f"Top {limit} pairs by volume on {exchange_id.upper()}:\n\n" +
+                 "\n".join(format_ticker(ticker, exchange_id) for ticker in sorted_tickers)
+        )
+    ]
+
+
+async def get_historical_ohlcv(
+    exchange: ccxt.Exchange, exchange_id: str, arguments: Dict[str, Any]
+) -> List[types.TextContent]:
+    """OHLCV candles for a trading pair."""
+    symbol = arguments.get("symbol", "").upper()
+    timeframe = arguments.get("timeframe", "1h")
+    days_back = min(int(arguments.get("days_back", 7)), 30)
+
+    # Calculate timestamps
+    since = int((datetime.now() - timedelta(days=days_back)).timestamp() * 1000)
+
+    # Fetch historical data
+    ohlcv = await exchange.fetch_ohlcv(symbol, timeframe, since=since)
+
+    # Large histories (e.g. 30 days of 1m candles) take long enough to
+    # format that they would stall other requests on the event loop
+    if len(ohlcv) > OHLCV_OFFLOAD_THRESHOLD:
+        formatted_data = await asyncio.to_thread(format_ohlcv_data, ohlcv, timeframe)
+    else:
+        formatted_data = format_ohlcv_data(ohlcv, timeframe)
+    return [
+        types.TextContent(
+            type="text",
+            text=f"Historical OHLCV data for {symbol} ({timeframe}) on {exchange_id.upper()}:\n\n{formatted_data}"
+        )
+    ]
+
+
+async def get_price_change(
+    exchange: ccxt.Exchange, exchange_id: str, arguments: Dict[str, Any]
+) -> List[types.TextContent]:
+    """Price change of a trading pair over several periods."""
+    symbol = arguments.get("symbol", "").upper()
+
+    # Get historical prices
+    timeframes = {
+        "1h": (1, "1h"),
+        "24h": (1, "1d"),
+        "7d": (7, "1d"),
+        "30d": (30, "1d")
+    }
+
+    # Fetch the current price and every period's candle concurrently; every fetch
+    # is awaited before the first error is raised, so none is left running
+    now = datetime.now()
+    results = await asyncio.gather(
+        exchange.fetch_ticker(symbol),
+        *(
+            exchange.fetch_ohlcv(
+                symbol,
+                timeframe,
+                since=int((now - timedelta(days=days)).timestamp() * 1000),
+                limit=1
+            )
+            for days, timeframe in timeframes.values()
         ),
+        return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    ticker, *history = results
+    current_price = ticker['last']
+
+    changes = []
+    for label, ohlcv in zip(timeframes, history):
+        if ohlcv:
+            start_price = ohlcv[0][1]  # Open price
+            change_pct = ((current_price - start_price) / start_price) * 100
+            changes.append(f"{label} change: {change_pct:+.2f}%")
+
+    return [
+        types.TextContent(
+            type="text",
+            text=f"Price changes for {symbol} on {exchange_id.upper()}:\n\n" + "\n".join(changes)
+        )
     ]
 
-@server.call_tool()
-async def handle_call_tool(
-    name: str, arguments: Dict[str, Any]
+
+async def get_volume_history(
+    exchange: ccxt.Exchange, exchange_id: str, arguments: Dict[str, Any]
 ) -> List[types.TextContent]:
-    """Handle tool execution requests."""
-    try:
-        if name == "list-exchanges":
-            exchange_list = "\n".join([f"- {ex.upper()}" for ex in SUPPORTED_EXCHANGES.keys()])
-            return [
-                types.TextContent(
-                    type="text",
-                    text=f"Supported exchanges:\n\n{exchange_list}"
-                )
-            ]
-
-        # Get exchange from arguments or use default
-        exchange_id = arguments.get("exchange", "coinbase")
-        exchange = await get_exchange(exchange_id)
-
-        if name == "get-price":
-            symbol = arguments.get("symbol", "").upper()
-            ticker = await exchange.fetch_ticker(symbol)
-
-            return [
-                types.TextContent(
-                    type="text",
-                    text=f"Current price of {symbol} on {exchange_id.upper()}: {ticker['last']} {symbol.split('/')[1]}"
-                )
-            ]
-
-        elif name == "get-market-summary":
-            symbol = arguments.get("symbol", "").upper()
-            ticker = await exchange.fetch_ticker(symbol)
-
-            formatted_data = await format_ticker(ticker, exchange_id)
-            return [
-                types.TextContent(
-                    type="text",
-                    text=f"Market summary for {symbol}:\n\n{formatted_data}"
-                )
-            ]
-
-        elif name == "get-top-volumes":
-            limit = int(arguments.get("limit", 5))
-            tickers = await exchange.fetch_tickers()
-
-            # Sort by volume and get top N
-            sorted_tickers = sorted(
-                tickers.values(),
-                key=lambda x: float(x.get('baseVolume', 0) or 0),
-                reverse=True
-            )[:limit]
-
-            formatted_results = []
-            for ticker in sorted_tickers:
-                formatted_data = await format_ticker(ticker, exchange_id)
-                formatted_results.append(formatted_data)
-
-            return [
-                types.TextContent(
-                    type="text",
-                    text=f"Top {limit} pairs by volume on {exchange_id.upper()}:\n\n" + "\n".join(formatted_results)
-                )
-            ]
-
-        elif name == "get-historical-ohlcv":
-            symbol = arguments.get("symbol", "").upper()
-            timeframe = arguments.get("timeframe", "1h")
-            days_back = min(int(arguments.get("days_back", 7)), 30)
-
-            # Calculate timestamps
-            since = int((datetime.now() - timedelta(days=days_back)).timestamp() * 1000)
-
-            # Fetch historical data
-            ohlcv = await exchange.fetch_ohlcv(symbol, timeframe, since=since)
-
-            formatted_data = format_ohlcv_data(ohlcv, timeframe)
-            return [
-                types.TextContent(
-                    type="text",
-                    text=f"Historical OHLCV data for {symbol} ({timeframe}) on {exchange_id.upper()}:\n\n{formatted_data}"
-                )
-            ]
-
-        elif name == "get-price-change":
-            symbol = arguments.get("symbol", "").upper()
-
-            # Get current price
-            ticker = await exchange.fetch_ticker(symbol)
-            current_price = ticker['last']
-
-            # Get historical prices
-            timeframes = {
-                "1h": (1, "1h"),
-                "24h": (1, "1d"),
-                "7d": (7, "1d"),
-                "30d": (30, "1d")
-            }
+    """Daily trading volume of a trading pair."""
+    symbol = arguments.get("symbol", "").upper()
+    days = min(int(arguments.get("days", 7)), 30)
+
+    # Get daily volume data
+    since = int((datetime.now() - timedelta(days=days)).timestamp() * 1000)
+    ohlcv = await exchange.fetch_ohlcv(symbol, "1d", since=since)
+
+    volume_data = []
+    for candle in ohlcv:
+        timestamp, _, _, _, _, volume = candle
+        dt = datetime.fromtimestamp(timestamp/1000).strftime('%Y-%m-%d')
+        volume_data.append(f"{dt}: {volume:,.2f}")
+
+    return [
+        types.TextContent(
+            type="text",
+            text=f"Daily trading volume history for {symbol} on {exchange_id.upper()}:\n\n" +
+                 "\n".join(volume_data)
+        )
+    ]
+
+
+# Tools that run against an exchange, keyed by tool name
+EXCHANGE_TOOL_HANDLERS = {
+    "get-price": get_price,
+    "get-market-summary": get_market_summary,
+    "get-top-volumes": get_top_volumes,
+    "get-historical-ohlcv": get_historical_ohlcv,
+    "get-price-change": get_price_change,
+    "get-volume-history": get_volume_history,
+}
+
+
+async def execute_tool(name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Run a tool and return its result."""
+    if name == "list-exchanges":
+        return await list_exchanges()
+
+    handler = EXCHANGE_TOOL_HANDLERS.get(name)
+    if handler is None:
+        raise ValueError(f"Unknown tool: {name}")
+
+    # Get exchange from arguments or use default
+    exchange_id = arguments.get("exchange", "coinbase")
+    exchange = await get_exchange(exchange_id)
+    return await handler(exchange, exchange_id, arguments)
+
+
+def get_cached_result(cache_key: str):
+    """Get a cached tool result if present and not expired."""
+    entry = result_cache.get(cache_key)
+    if entry is None:
+        return None
+    cached_at, result = entry
+    if time.monotonic() - cached_at > RESULT_CACHE_TTL:
+        del result_cache[cache_key]
+        return None
+    result_cache.move_to_end(cache_key)
+    return result
+
+
+def cache_result(cache_key: str, result: List[types.TextContent]):
+    """Store a tool result, evicting the least recently used entry."""
+    result_cache[cache_key] = (time.monotonic(), result)
+    result_cache.move_to_end(cache_key)
+    if len(result_cache) > RESULT_CACHE_SIZE:
+        result_cache.popitem(last=False)
 
-            changes = []
-            for label, (days, timeframe) in timeframes.items():
-                since = int((datetime.now() - timedelta(days=days)).timestamp() * 1000)
-                ohlcv = await exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=1)
-                if ohlcv:
-                    start_price = ohlcv[0][1]  # Open price
-                    change_pct = ((current_price - start_price) / start_price) * 100
-                    changes.append(f"{label} change: {change_pct:+.2f}%")
-
-            return [
-                types.TextContent(
-                    type="text",
-                    text=f"Price changes for {symbol} on {exchange_id.upper()}:\n\n" + "\n".join(changes)
-                )
-            ]
-
-        elif name == "get-volume-history":
-            symbol = arguments.get("symbol", "").upper()
-            days = min(int(arguments.get("days", 7)), 30)
-
-            # Get daily volume data
-            since = int((datetime.now() - timedelta(days=days)).timestamp() * 1000)
-            ohlcv = await exchange.fetch_ohlcv(symbol, "1d", since=since)
-
-            volume_data = []
-            for candle in ohlcv:
-                timestamp, _, _, _, _, volume = candle
-                dt = datetime.fromtimestamp(timestamp/1000).strftime('%Y-%m-%d')
-                volume_data.append(f"{dt}: {volume:,.2f}")
-
-            return [
-                types.TextContent(
-                    type="text",
-                    text=f"Daily trading volume history for {symbol} on {exchange_id.upper()}:\n\n" +
-                         "\n".join(volume_data)
-                )
-            ]
-
-        else:
-            raise ValueError(f"Unknown tool: {name}")
 
+async def run_tool(cache_key: str, name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Run a tool, caching its result on success."""
+    try:
+        result = await execute_tool(name, arguments)
     except ccxt.BaseError as e:
         return [
             types.TextContent(
@@ -366,28 +478,51 @@ async def handle_call_tool(
                 text=f"Error accessing cryptocurrency data: {str(e)}"
             )
         ]
-    finally:
-        # Clean up exchange connections
-        for instance in exchange_instances.values():
-            await instance.close()
-        exchange_instances.clear()
+
+    cache_result(cache_key, result)
+    return result
+
+
+@server.call_tool()
+async def handle_call_tool(
+    name: str, arguments: Dict[str, Any]
+) -> List[types.TextContent]:
+    """Handle tool execution requests."""
+    # Identical calls share one exchange round-trip: concurrent ones join the
+    # in-flight task, later ones within RESULT_CACHE_TTL get the cached result
+    cache_key = f"{name}|{json.dumps(arguments or {}, sort_keys=True, default=str)}"
+    cached = get_cached_result(cache_key)
+    if cached is not None:
+        return cached
+
+    task = pending_results.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(run_tool(cache_key, name, arguments))
+        pending_results[cache_key] = task
+        task.add_done_callback(lambda _: pending_results.pop(cache_key, None))
+    # Shielded so one cancelled caller does not cancel the request the others wait on
+    return await asyncio.shield(task)
 
 
 async def main():
     """Run the server using stdin/stdout streams."""
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="crypto-server",
-                server_version="0.1.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
+    try:
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="crypto-server",
+                    server_version="0.1.0",
+                    capabilities=server.get_capabilities(
+                        notification_options=NotificationOptions(),
+                        experimental_capabilities={},
+                    ),
                 ),
-            ),
-        )
+            )
+    finally:
+        # Exchanges stay open across calls to reuse connections and loaded markets
+        await close_exchanges()
 
 
 def run_server():
@@ -12,11 +12,10 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from client.mcp_client import MCPClientManager
 from client.agent import GroqAgent
 
-async def test_mcp_client():
+async def test_mcp_client(manager):
     """Test MCP client initialization."""
     print("🔍 Testing MCP Client...")
     try:
-        manager = MCPClientManager("config/mcp_servers.json")
         async with await manager.get_managed_client() as client:
             print("✅ MCP Client initialized successfully")
             return True
@@ -24,11 +23,10 @@ async def test_mcp_client():
         print(f"❌ MCP Client test failed: {e}")
         return False
 
-async def test_agent():
+async def test_agent(manager):
     """Test Groq Agent initialization."""
     print("🔍 Testing Groq Agent...")
     try:
-        manager = MCPClientManager("config/mcp_servers.json")
         agent = GroqAgent(manager)
         tools = await agent.get_available_tools()
         print(f"✅ Groq Agent initialized with tools: {tools}")
@@ -61,11 +59,16 @@ async def main():
         test_agent
     ]
     
+    # Share one MCP client across tests so each server is spawned only once
+    manager = MCPClientManager("config/mcp_servers.json")
     results = []
-    for test in tests:
-        result = await test()
-        results.append(result)
-        print()
+    try:
+        for test in tests:
+            result = await test(manager)
+            results.append(result)
+            print()
+    finally:
+        await manager.cleanup()
     
     # Summary
     passed = sum(results)